@@ -2,14 +2,23 @@ import sys
 import os
 import math
 import logging
+import logging.handlers
+import queue
+from bisect import bisect_left, bisect_right
 from pathlib import Path
 from typing import List
 
 import pygame
 
-from .physics import Rect, resolve_collisions
+from .physics import (
+    Rect,
+    SpatialHashGrid,
+    friction_decay,
+    integrate_velocity,
+    resolve_collisions,
+)
 from dataclasses import dataclass
-from typing import Tuple, Optional
+from typing import Dict, Tuple, Optional
 
 
 WIDTH, HEIGHT = 800, 600
@@ -19,12 +28,74 @@ MOVE_ACCEL = 8000.0
 MOVE_MAX_SPEED = 300.0
 GROUND_FRICTION = 8.0  # per second
 AIR_FRICTION = 1.5
+# Per-frame velocity decay at the nominal frame time, indexed by on_ground
+FRAME_DECAY = (math.exp(-AIR_FRICTION / FPS), math.exp(-GROUND_FRICTION / FPS))
 JUMP_SPEED = 820.0  # base jump speed (adjustable)
+MAX_FALL_SPEED = 1000.0
 COYOTE_TIME = 0.12  # seconds after leaving ground to still allow jump
 JUMP_BUFFER = 0.12  # seconds to buffer jump input
 
 PLAYER_W, PLAYER_H = 40, 50
 
+# Movement keys, resolved once instead of per-frame attribute lookups
+K_LEFT_A, K_LEFT_ARROW = pygame.K_a, pygame.K_LEFT
+K_RIGHT_D, K_RIGHT_ARROW = pygame.K_d, pygame.K_RIGHT
+CHEAT_KEYS = (pygame.K_SLASH, pygame.K_KP_DIVIDE)
+
+HUD_STATIC_LINES = (
+    "A/D or Left/Right: Move",
+    "Space/W/Up: Jump",
+    "PgUp/PgDn: Gravity +/-",
+    "-/=: Jump strength -/+",
+    "R: Reset, Esc: Quit",
+)
+HUD_COLOR = (220, 220, 230)
+HUD_LINE_H = 18
+
+# Fonts keyed by (name, size); cleared when pygame shuts down
+_font_cache: Dict[Tuple[Optional[str], int], "pygame.font.Font"] = {}
+
+
+def _get_font(size: int, name: Optional[str] = None) -> "pygame.font.Font":
+    font = _font_cache.get((name, size))
+    if font is None:
+        font = pygame.font.Font(name, size)
+        _font_cache[(name, size)] = font
+    return font
+
+
+def _build_static_hud() -> "pygame.Surface":
+    """Bake the fixed help lines into one transparent surface."""
+    font = _get_font(16)
+    lines = [font.render(t, True, HUD_COLOR) for t in HUD_STATIC_LINES]
+    width = max(surf.get_width() for surf in lines)
+    atlas = pygame.Surface((width, len(lines) * HUD_LINE_H), pygame.SRCALPHA)
+    for i, surf in enumerate(lines):
+        atlas.blit(surf, (0, i * HUD_LINE_H))
+    return atlas
+
+
+class _LiveHud:
+    """
+    The changing HUD lines, composed onto one surface.
+
+    The surface is redrawn only when the text differs from the last frame;
+    otherwise the cached surface is blitted as-is.
+    """
+
+    def __init__(self, width: int, n_lines: int):
+        self.surf = pygame.Surface((width, n_lines * HUD_LINE_H), pygame.SRCALPHA)
+        self.last_key: Optional[Tuple[str, ...]] = None
+
+    def draw(self, screen, pos: Tuple[int, int], lines: Tuple[str, ...]):
+        if lines != self.last_key:
+            font = _get_font(16)
+            self.surf.fill((0, 0, 0, 0))
+            for i, text in enumerate(lines):
+                self.surf.blit(font.render(text, True, HUD_COLOR), (0, i * HUD_LINE_H))
+            self.last_key = lines
+        screen.blit(self.surf, pos)
+
 
 @dataclass
 class Door:
@@ -52,12 +123,12 @@ def build_top_board() -> Tuple[List[Rect], List[Door], Tuple[float, float]]:
         solids.append(Rect(x, y, platform_w, platform_h))
 
     # Find the highest platform within the visible width
-    top_candidates = [
-        s for s in solids if 0 <= s.x < WIDTH and s.w >= 100 and s.h <= 40 and s.y < HEIGHT - 60
-    ]
-    if top_candidates:
-        top_plat = min(top_candidates, key=lambda r: r.y)
-    else:
+    top_plat: Optional[Rect] = None
+    for s in solids:
+        if 0 <= s.x < WIDTH and s.w >= 100 and s.h <= 40 and s.y < HEIGHT - 60:
+            if top_plat is None or s.y < top_plat.y:
+                top_plat = s
+    if top_plat is None:
         # Fallback to the floor if something goes odd
         top_plat = Rect(WIDTH // 2 - platform_w // 2, HEIGHT - 1000, platform_w, platform_h)
 
@@ -118,7 +189,7 @@ def build_diamond_board() -> Tuple[List[Rect], List[Door], Tuple[float, float]]:
         solids.append(Rect(x, y, plat_w, plat_h))
 
     # Highest platform
-    top_plat = min([s for s in solids if s.h <= 40 and s.w >= 60], key=lambda r: r.y)
+    top_plat = min((s for s in solids if s.h <= 40 and s.w >= 60), key=lambda r: r.y)
 
     # Door at the top returning to top board
     door_w, door_h = 40, 60
@@ -156,17 +227,83 @@ def build_spades_board() -> Tuple[List[Rect], List[Door], Tuple[float, float]]:
     return solids, doors, spawn
 
 
-def build_board(name: str) -> Tuple[List[Rect], List[Door], Tuple[float, float]]:
-    if name == "top":
-        return build_top_board()
-    elif name == "placeholder":
-        return build_placeholder_board()
+def _board_bounds(solids: List[Rect]) -> Tuple[float, float]:
+    """Progress bounds: base is the floor, top is the highest platform-like solid."""
+    base = HEIGHT - 40
+    top = None
+    for s in solids:
+        # Platform-like: not huge walls, within screen, reasonable size
+        if s.h <= 60 and s.w >= 40 and s.right > 0 and s.x < WIDTH:
+            if top is None or s.y < top:
+                top = s.y
+    return base, (base - 1 if top is None else top)
+
+
+def build_board(
+    name: str,
+) -> Tuple[List[Rect], List[Door], Tuple[float, float], float, float]:
+    """Build a board by name; returns (solids, doors, spawn, base_y, top_y)."""
+    if name == "placeholder":
+        solids, doors, spawn = build_placeholder_board()
     elif name == "diamond":
-        return build_diamond_board()
+        solids, doors, spawn = build_diamond_board()
     elif name == "spades":
-        return build_spades_board()
+        solids, doors, spawn = build_spades_board()
     else:
-        return build_top_board()
+        solids, doors, spawn = build_top_board()
+    base_y, top_y = _board_bounds(solids)
+    return solids, doors, spawn, base_y, top_y
+
+
+def _solid_sprites(board: str, solids: List[Rect]) -> List[tuple]:
+    """(solid, screen rect, color) per solid; the caller sets rect.y each frame."""
+    sprites = []
+    for s in solids:
+        color = (80, 200, 120)
+        if board == "spades":
+            color = (60, 60, 70)  # dark gray platforms/walls/floor
+        elif board == "diamond":
+            # Color narrow platforms red; leave floor/walls green
+            is_floor = (abs(s.y - (HEIGHT - 40)) < 0.5 and abs(s.w - WIDTH) < 0.5)
+            is_platform_like = (s.h <= 30 and s.w <= 130 and s.y < HEIGHT - 60)
+            if is_platform_like and not is_floor:
+                color = (200, 70, 70)
+        sprites.append((s, pygame.Rect(int(s.x), int(s.y), int(s.w), int(s.h)), color))
+    return sprites
+
+
+class _SolidLayer:
+    """
+    Solid sprites sorted by top edge, so the rows in view are a bisect slice.
+
+    Solids taller than the screen (side walls) can be in view from almost
+    anywhere and are kept apart; they would otherwise widen every slice.
+    """
+
+    def __init__(self, sprites: List[tuple]):
+        self.tall = [sp for sp in sprites if sp[0].h > HEIGHT]
+        self.sprites = sorted((sp for sp in sprites if sp[0].h <= HEIGHT), key=lambda sp: sp[0].y)
+        self.tops = [sp[0].y for sp in self.sprites]
+        self.max_h = max((sp[0].h for sp in self.sprites), default=0)
+
+    def near(self, top: float, bottom: float) -> List[tuple]:
+        """Sprites that may overlap the band [top, bottom]."""
+        lo = bisect_left(self.tops, top - self.max_h)
+        hi = bisect_right(self.tops, bottom)
+        return self.tall + self.sprites[lo:hi]
+
+
+def _door_sprites(doors: List[Door], font) -> List[tuple]:
+    """(door, screen rect, color, label surface, label dx, label dy) per door."""
+    sprites = []
+    for d in doors:
+        rect = pygame.Rect(int(d.rect.x), int(d.rect.y), int(d.rect.w), int(d.rect.h))
+        color = (220, 80, 80) if d.label == "♦" else (40, 40, 60)
+        label_surf = font.render(d.label, True, (240, 240, 255))
+        label_dx = rect.w // 2 - label_surf.get_width() // 2
+        label_dy = rect.h // 2 - label_surf.get_height() // 2
+        sprites.append((d, rect, color, label_surf, label_dx, label_dy))
+    return sprites
 
 
 def run():
@@ -174,308 +311,323 @@ def run():
     log_dir = Path.cwd() / "logs"
     log_dir.mkdir(parents=True, exist_ok=True)
     log_path = log_dir / "game.log"
-    logging.basicConfig(
-        level=logging.INFO,
-        filename=str(log_path),
-        filemode="w",
-        format="%(asctime)s %(levelname)s %(message)s",
-    )
+    # Per-frame logging is opt-in for interactive play; headless runs keep it on
+    headless = os.environ.get("PYGAME_HEADLESS_TEST")
+    log_frames = bool(headless) or os.environ.get("GHASTER_LOG") == "1"
+    file_handler = logging.FileHandler(str(log_path), mode="w")
+    file_handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(message)s"))
+    # File writes happen on the listener's thread, off the game loop
+    log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(-1)
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    listener = logging.handlers.QueueListener(log_queue, file_handler)
     logger = logging.getLogger("game")
-
-    pygame.init()
-    pygame.display.set_caption("Tiny Platformer")
-    screen = pygame.display.set_mode((WIDTH, HEIGHT))
-    clock = pygame.time.Clock()
-
-    # Game state
-    current_board = "top"
-    solids, doors, spawn = build_board(current_board)
-    player = Rect(spawn[0], spawn[1], PLAYER_W, PLAYER_H)
-    vx, vy = 0.0, 0.0
-    on_ground = False
-    gravity = GRAVITY
-    jump_speed = JUMP_SPEED
-    coyote_timer = 0.0
-    jump_buffer = 0.0
-    jump_held = False
-
-    camera_y = 0.0
-
-    # Cheat input state (e.g., "/d" for diamond, "/s" for spades)
-    cheat_active = False
-    cheat_buffer = ""
-
-    # Level bounds for progress: base is floor, top is highest platform
-    def compute_bounds(solids_list: List[Rect]) -> Tuple[float, float]:
-        base = HEIGHT - 40
-        # Consider platform-like solids: not huge walls, within screen, reasonable size
-        candidates = [
-            s
-            for s in solids_list
-            if (s.h <= 60) and (s.w >= 40) and (s.x + s.w > 0) and (s.x < WIDTH)
-        ]
-        top = min((s.y for s in candidates), default=base - 1)
-        return base, top
-
-    base_y, top_y = compute_bounds(solids)
-
-    # Use default font to avoid dependency on system font config (fc-list)
-    font_small = pygame.font.Font(None, 18)
-
-    def try_enter_door(player_rect: Rect) -> Optional[Door]:
-        for d in doors:
-            if player_rect.intersects(d.rect):
-                return d
-        return None
-
-    def switch_board(name: str, door_from: Optional[Door] = None):
-        nonlocal solids, doors, spawn, current_board, player, vx, vy, on_ground, base_y, top_y, camera_y
-        current_board = name
-        solids, doors, spawn = build_board(name)
-        # Place player at spawn; if coming from a door, keep horizontal center if reasonable
-        px = spawn[0]
-        py = spawn[1]
-        player = Rect(px, py, PLAYER_W, PLAYER_H)
+    logger.setLevel(logging.INFO if log_frames else logging.WARNING)
+    logger.addHandler(queue_handler)
+    listener.start()
+    try:
+        pygame.init()
+        pygame.display.set_caption("Tiny Platformer")
+        screen = pygame.display.set_mode((WIDTH, HEIGHT))
+        clock = pygame.time.Clock()
+
+        # Game state
+        current_board = "top"
+        # Progress runs from base (floor) to top (highest platform)
+        solids, doors, spawn, base_y, top_y = build_board(current_board)
+        grid = SpatialHashGrid(solids)
+        player = Rect(spawn[0], spawn[1], PLAYER_W, PLAYER_H)
         vx, vy = 0.0, 0.0
         on_ground = False
-        base_y, top_y = compute_bounds(solids)
-        camera_y = max(0.0, player.y - HEIGHT * 0.5)
-
-    running = True
-    # In headless test mode, exit after a few frames to avoid blocking CI/CLI
-    headless = os.environ.get("PYGAME_HEADLESS_TEST")
-    max_frames = 12 if headless else None
-    frames = 0
-    while running:
-        dt = clock.tick(FPS) / 1000.0
-
-        # Input
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                running = False
-            elif event.type == pygame.KEYDOWN:
-                # Capture textual input for simple cheats starting with '/'
-                try:
-                    ch = event.unicode
-                except Exception:
-                    ch = ""
-                if ch == "/":
-                    cheat_active = True
-                    cheat_buffer = ""
-                elif cheat_active and ch:
-                    if ch.lower() in ("d", "s"):
-                        if ch.lower() == "d":
+        gravity = GRAVITY
+        jump_speed = JUMP_SPEED
+        coyote_timer = 0.0
+        jump_buffer = 0.0
+        jump_held = False
+
+        camera_y = 0.0
+
+        # Cheat input state (e.g., "/d" for diamond, "/s" for spades)
+        cheat_active = False
+        cheat_buffer = ""
+
+        # Use default font to avoid dependency on system font config (fc-list)
+        font_small = _get_font(18)
+        static_hud = _build_static_hud()
+        live_hud = _LiveHud(WIDTH // 2, 4)
+        progress_frame = _build_progress_frame()
+        backgrounds: Dict[str, pygame.Surface] = {}
+        # Screen rects are built once per board; only their y follows the camera
+        solid_layer = _SolidLayer(_solid_sprites(current_board, solids))
+        door_sprites = _door_sprites(doors, font_small)
+        prect = pygame.Rect(0, 0, PLAYER_W, PLAYER_H)
+
+        def try_enter_door(player_rect: Rect) -> Optional[Door]:
+            for d in doors:
+                if player_rect.intersects(d.rect):
+                    return d
+            return None
+
+        def switch_board(name: str, door_from: Optional[Door] = None):
+            nonlocal solids, grid, solid_layer, door_sprites, doors, spawn, current_board, player, vx, vy, on_ground, base_y, top_y, camera_y
+            current_board = name
+            solids, doors, spawn, base_y, top_y = build_board(name)
+            grid = SpatialHashGrid(solids)
+            solid_layer = _SolidLayer(_solid_sprites(name, solids))
+            door_sprites = _door_sprites(doors, font_small)
+            # Place player at spawn; if coming from a door, keep horizontal center if reasonable
+            px = spawn[0]
+            py = spawn[1]
+            player = Rect(px, py, PLAYER_W, PLAYER_H)
+            vx, vy = 0.0, 0.0
+            on_ground = False
+            camera_y = max(0.0, player.y - HEIGHT * 0.5)
+
+        running = True
+        # In headless test mode, exit after a few frames to avoid blocking CI/CLI
+        max_frames = 12 if headless else None
+        frames = 0
+        while running:
+            dt = clock.tick(FPS) / 1000.0
+
+            # Input
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    running = False
+                elif event.type == pygame.KEYDOWN:
+                    # Capture textual input for simple cheats starting with '/';
+                    # the text is only looked at while a cheat is being typed
+                    if event.key in CHEAT_KEYS:
+                        cheat_active = True
+                        cheat_buffer = ""
+                    elif cheat_active and event.unicode:
+                        ch = event.unicode
+                        if ch in ("d", "D"):
                             switch_board("diamond")
-                        elif ch.lower() == "s":
+                            cheat_active = False
+                            cheat_buffer = ""
+                        elif ch in ("s", "S"):
                             switch_board("spades")
-                        cheat_active = False
-                        cheat_buffer = ""
-                    elif ch in ("\r", "\n", " "):
-                        cheat_active = False
-                        cheat_buffer = ""
-                    else:
-                        cheat_buffer += ch
-                        # Keep buffer small; cancel if unexpected long
-                        if len(cheat_buffer) > 8:
                             cheat_active = False
                             cheat_buffer = ""
-                if event.key == pygame.K_ESCAPE:
+                        elif ch in ("\r", "\n", " "):
+                            cheat_active = False
+                            cheat_buffer = ""
+                        else:
+                            cheat_buffer += ch
+                            # Keep buffer small; cancel if unexpected long
+                            if len(cheat_buffer) > 8:
+                                cheat_active = False
+                                cheat_buffer = ""
+                    if event.key == pygame.K_ESCAPE:
+                        running = False
+                    if event.key == pygame.K_r:
+                        # Reset to top board spawn
+                        switch_board("top")
+                        gravity = GRAVITY
+                        jump_speed = JUMP_SPEED
+                    if event.key == pygame.K_BACKSPACE and cheat_active:
+                        cheat_buffer = cheat_buffer[:-1]
+                        if not cheat_buffer:
+                            # remain active waiting for next char
+                            pass
+                    if event.key in (pygame.K_SPACE, pygame.K_w, pygame.K_UP):
+                        # If overlapping a door and pressing up/w, enter door instead of jump
+                        entered = False
+                        if event.key in (pygame.K_w, pygame.K_UP) and on_ground:
+                            d = try_enter_door(player)
+                            if d is not None:
+                                switch_board(d.target_board, d)
+                                jump_buffer = 0.0
+                                jump_held = False
+                                entered = True
+                        if not entered:
+                            jump_buffer = JUMP_BUFFER
+                            jump_held = True
+                    if event.key == pygame.K_PAGEUP:
+                        gravity = min(4000.0, gravity + 100.0)
+                    if event.key == pygame.K_PAGEDOWN:
+                        gravity = max(100.0, gravity - 100.0)
+                    if event.key == pygame.K_EQUALS:  # '+' key without shift
+                        jump_speed = min(2000.0, jump_speed + 40.0)
+                    if event.key == pygame.K_MINUS:
+                        jump_speed = max(200.0, jump_speed - 40.0)
+                elif event.type == pygame.KEYUP:
+                    if event.key in (pygame.K_SPACE, pygame.K_w, pygame.K_UP):
+                        jump_held = False
+                        # Variable jump height: cut upward velocity when jump released
+                        if vy < 0:
+                            vy *= 0.45
+
+            keys = pygame.key.get_pressed()
+            # Opposing keys cancel out: ax is -MOVE_ACCEL, 0 or +MOVE_ACCEL
+            left = keys[K_LEFT_A] | keys[K_LEFT_ARROW]
+            right = keys[K_RIGHT_D] | keys[K_RIGHT_ARROW]
+            ax = MOVE_ACCEL * (right - left)
+
+            # friction depends on grounded (before this frame's jump)
+            if abs(dt * FPS - 1.0) <= 0.05:
+                decay = FRAME_DECAY[on_ground]
+            else:
+                decay = friction_decay(GROUND_FRICTION if on_ground else AIR_FRICTION, dt)
+
+            # coyote time and jump buffer
+            if on_ground:
+                coyote_timer = COYOTE_TIME
+            else:
+                coyote_timer = max(0.0, coyote_timer - dt)
+
+            jump_buffer = max(0.0, jump_buffer - dt)
+            if jump_buffer > 0 and (on_ground or coyote_timer > 0):
+                vy = -jump_speed
+                on_ground = False
+                jump_buffer = 0.0
+
+            # acceleration/friction and gravity
+            vx, vy = integrate_velocity(
+                vx, vy, ax, decay, gravity, dt, MOVE_MAX_SPEED, MAX_FALL_SPEED
+            )
+
+            # integrate with collision resolution
+            dx, dy = vx * dt, vy * dt
+            player, rdx, rdy, landed, hit_ceiling = resolve_collisions(player, dx, dy, grid)
+            # Zero velocities on collision resolution
+            if rdx != dx:
+                vx = 0.0
+            if rdy != dy or landed or hit_ceiling:
+                vy = 0.0
+            on_ground = landed
+
+            # Log position and velocity each frame (only)
+            if log_frames:
+                logger.info("POS x=%.2f y=%.2f VEL vx=%.2f vy=%.2f", player.x, player.y, vx, vy)
+
+            # No death on falling; you can always climb back up
+
+            # vertical camera follow (fixed width)
+            target_cy = player.y - HEIGHT * 0.5
+            camera_y += (target_cy - camera_y) * min(1.0, dt * 5)
+
+            # render
+            background = backgrounds.get(current_board)
+            if background is None:
+                background = backgrounds[current_board] = _build_background(current_board)
+            screen.blit(background, (0, 0))
+
+            # draw level (only solids overlapping the view)
+            view_bottom = camera_y + HEIGHT
+            for s, rect, color in solid_layer.near(camera_y, view_bottom):
+                if s.bottom < camera_y or s.y > view_bottom:
+                    continue
+                rect.y = int(s.y - camera_y)
+                pygame.draw.rect(screen, color, rect)
+
+            # draw doors
+            for d, rect, color, label_surf, label_dx, label_dy in door_sprites:
+                rect.y = int(d.rect.y - camera_y)
+                pygame.draw.rect(screen, color, rect)
+                pygame.draw.rect(screen, (230, 230, 240), rect, 2)
+                # Label
+                screen.blit(label_surf, (rect.x + label_dx, rect.y + label_dy))
+
+            # draw player
+            prect.x = int(player.x)
+            prect.y = int(player.y - camera_y)
+            pygame.draw.rect(screen, (240, 220, 90), prect)
+
+            # HUD
+            _draw_hud(screen, static_hud, live_hud, on_ground, gravity, jump_speed, player.y, base_y, top_y)
+            _draw_progress_bar(screen, progress_frame, player.y, base_y, top_y)
+
+            pygame.display.flip()
+
+            if max_frames is not None:
+                frames += 1
+                if frames >= max_frames:
                     running = False
-                if event.key == pygame.K_r:
-                    # Reset to top board spawn
-                    switch_board("top")
-                    gravity = GRAVITY
-                    jump_speed = JUMP_SPEED
-                if event.key == pygame.K_BACKSPACE and cheat_active:
-                    cheat_buffer = cheat_buffer[:-1]
-                    if not cheat_buffer:
-                        # remain active waiting for next char
-                        pass
-                if event.key in (pygame.K_SPACE, pygame.K_w, pygame.K_UP):
-                    # If overlapping a door and pressing up/w, enter door instead of jump
-                    entered = False
-                    if event.key in (pygame.K_w, pygame.K_UP) and on_ground:
-                        d = try_enter_door(player)
-                        if d is not None:
-                            switch_board(d.target_board, d)
-                            jump_buffer = 0.0
-                            jump_held = False
-                            entered = True
-                    if not entered:
-                        jump_buffer = JUMP_BUFFER
-                        jump_held = True
-                if event.key == pygame.K_PAGEUP:
-                    gravity = min(4000.0, gravity + 100.0)
-                if event.key == pygame.K_PAGEDOWN:
-                    gravity = max(100.0, gravity - 100.0)
-                if event.key == pygame.K_EQUALS:  # '+' key without shift
-                    jump_speed = min(2000.0, jump_speed + 40.0)
-                if event.key == pygame.K_MINUS:
-                    jump_speed = max(200.0, jump_speed - 40.0)
-            elif event.type == pygame.KEYUP:
-                if event.key in (pygame.K_SPACE, pygame.K_w, pygame.K_UP):
-                    jump_held = False
-                    # Variable jump height: cut upward velocity when jump released
-                    if vy < 0:
-                        vy *= 0.45
-
-        keys = pygame.key.get_pressed()
-        ax = 0.0
-        if keys[pygame.K_a] or keys[pygame.K_LEFT]:
-            ax -= MOVE_ACCEL
-        if keys[pygame.K_d] or keys[pygame.K_RIGHT]:
-            ax += MOVE_ACCEL
-
-        # friction depends on grounded
-        friction = GROUND_FRICTION if on_ground else AIR_FRICTION
-        if abs(ax) < 1e-3:
-            vx -= vx * friction * dt
-        else:
-            vx += ax * dt
-            vx = max(-MOVE_MAX_SPEED, min(MOVE_MAX_SPEED, vx))
-
-        # coyote time and jump buffer
-        if on_ground:
-            coyote_timer = COYOTE_TIME
-        else:
-            coyote_timer = max(0.0, coyote_timer - dt)
-
-        jump_buffer = max(0.0, jump_buffer - dt)
-        if jump_buffer > 0 and (on_ground or coyote_timer > 0):
-            vy = -jump_speed
-            on_ground = False
-            jump_buffer = 0.0
-
-        # gravity
-        vy += gravity * dt
-        vy = min(vy, 1000.0)
-
-        # integrate with collision resolution
-        dx, dy = vx * dt, vy * dt
-        player, rdx, rdy, landed, hit_ceiling = resolve_collisions(player, dx, dy, solids)
-        # Zero velocities on collision resolution
-        if rdx != dx:
-            vx = 0.0
-        if rdy != dy or landed or hit_ceiling:
-            vy = 0.0
-        on_ground = landed
-
-        # Log position and velocity each frame (only)
-        logger.info("POS x=%.2f y=%.2f VEL vx=%.2f vy=%.2f", player.x, player.y, vx, vy)
-
-        # No death on falling; you can always climb back up
-
-        # vertical camera follow (fixed width)
-        target_cy = player.y - HEIGHT * 0.5
-        camera_y += (target_cy - camera_y) * min(1.0, dt * 5)
-
-        # render
-        if current_board == "spades":
-            # Medium blue-gray background, no parallax
-            screen.fill((75, 95, 120))
-        else:
-            screen.fill((18, 18, 24))
-
-            # parallax background bands
-            for i, color in enumerate([(35, 35, 55), (28, 28, 44), (24, 24, 38)]):
-                band_y = HEIGHT - 80 - i * 16
-                pygame.draw.rect(screen, color, (0, band_y, WIDTH, HEIGHT - band_y))
-
-        # draw level
-        for s in solids:
-            rect = pygame.Rect(int(s.x), int(s.y - camera_y), int(s.w), int(s.h))
-            color = (80, 200, 120)
-            if current_board == "spades":
-                color = (60, 60, 70)  # dark gray platforms/walls/floor
-            elif current_board == "diamond":
-                # Color narrow platforms red; leave floor/walls green
-                is_floor = (abs(s.y - (HEIGHT - 40)) < 0.5 and abs(s.w - WIDTH) < 0.5)
-                is_platform_like = (s.h <= 30 and s.w <= 130 and s.y < HEIGHT - 60)
-                if is_platform_like and not is_floor:
-                    color = (200, 70, 70)
-            pygame.draw.rect(screen, color, rect)
-
-        # draw doors
-        for d in doors:
-            rect = pygame.Rect(int(d.rect.x), int(d.rect.y - camera_y), int(d.rect.w), int(d.rect.h))
-            color = (220, 80, 80) if d.label == "♦" else (40, 40, 60)
-            pygame.draw.rect(screen, color, rect)
-            pygame.draw.rect(screen, (230, 230, 240), rect, 2)
-            # Label
-            label_surf = font_small.render(d.label, True, (240, 240, 255))
-            lx = rect.x + rect.w // 2 - label_surf.get_width() // 2
-            ly = rect.y + rect.h // 2 - label_surf.get_height() // 2
-            screen.blit(label_surf, (lx, ly))
-
-        # draw player
-        prect = pygame.Rect(int(player.x), int(player.y - camera_y), int(player.w), int(player.h))
-        pygame.draw.rect(screen, (240, 220, 90), prect)
-
-        # HUD
-        _draw_hud(screen, on_ground, gravity, jump_speed, player.y, base_y, top_y)
-        _draw_progress_bar(screen, player.y, base_y, top_y)
-
-        pygame.display.flip()
-
-        if max_frames is not None:
-            frames += 1
-            if frames >= max_frames:
-                running = False
-
-    pygame.quit()
+    finally:
+        # Also on a crash, so the last frames before it reach the log
+        _font_cache.clear()
+        pygame.quit()
+        listener.stop()
+        logger.removeHandler(queue_handler)
+        file_handler.close()
     return 0
 
 
 def _draw_hud(
-    screen, on_ground: bool, gravity: float, jump_speed: float, py: float, base_y: float, top_y: float
+    screen,
+    static_hud,
+    live_hud,
+    on_ground: bool,
+    gravity: float,
+    jump_speed: float,
+    py: float,
+    base_y: float,
+    top_y: float,
 ):
-    # Default pygame font avoids 'fc-list' dependency
-    font = pygame.font.Font(None, 16)
     # compute progress
     total = max(1.0, base_y - top_y)
     climbed = max(0.0, base_y - py)
     prog = max(0.0, min(1.0, climbed / total))
-    lines = [
-        "A/D or Left/Right: Move",
-        "Space/W/Up: Jump",
-        "PgUp/PgDn: Gravity +/-",
-        "-/=: Jump strength -/+",
-        "R: Reset, Esc: Quit",
+    lines = (
         f"On ground: {'yes' if on_ground else 'no'}",
         f"Gravity: {gravity:.0f} px/s^2",
         f"Jump: {jump_speed:.0f} px/s",
         f"Height: {climbed:.0f} / {total:.0f} px ({prog*100:.0f}%)",
-    ]
-    for i, text in enumerate(lines):
-        surf = font.render(text, True, (220, 220, 230))
-        screen.blit(surf, (12, 10 + i * 18))
+    )
+    screen.blit(static_hud, (12, 10))
+    live_hud.draw(screen, (12, 10 + len(HUD_STATIC_LINES) * HUD_LINE_H), lines)
 
 
-def _draw_progress_bar(screen, py: float, base_y: float, top_y: float):
-    import pygame
+# Progress bar geometry
+BAR_W = 10
+BAR_MARGIN = 16
+BAR_X = WIDTH - BAR_MARGIN - BAR_W
+BAR_Y = 50
+BAR_H = HEIGHT - 100
 
-    total = max(1.0, base_y - top_y)
-    climbed = max(0.0, base_y - py)
-    prog = max(0.0, min(1.0, climbed / total))
 
-    # Bar geometry
-    bar_w = 10
-    margin = 16
-    x = WIDTH - margin - bar_w
-    y = 50
-    h = HEIGHT - 100
+def _build_background(board: str) -> "pygame.Surface":
+    """Board backdrop (fill and parallax bands); static for the whole board."""
+    bg = pygame.Surface((WIDTH, HEIGHT)).convert()
+    if board == "spades":
+        # Medium blue-gray background, no parallax
+        bg.fill((75, 95, 120))
+    else:
+        bg.fill((18, 18, 24))
+
+        # parallax background bands
+        for i, color in enumerate([(35, 35, 55), (28, 28, 44), (24, 24, 38)]):
+            band_y = HEIGHT - 80 - i * 16
+            pygame.draw.rect(bg, color, (0, band_y, WIDTH, HEIGHT - band_y))
+    return bg
+
 
+def _build_progress_frame() -> "pygame.Surface":
+    """Outline, background and ticks of the progress bar; blit at (BAR_X - 6, BAR_Y - 2)."""
+    frame = pygame.Surface((BAR_W + 8, BAR_H + 4), pygame.SRCALPHA)
+    # Local coordinates of the bar's top-left corner
+    x, y = 6, 2
     # Outline
-    pygame.draw.rect(screen, (60, 60, 80), (x - 2, y - 2, bar_w + 4, h + 4), 2)
+    pygame.draw.rect(frame, (60, 60, 80), (x - 2, y - 2, BAR_W + 4, BAR_H + 4), 2)
     # Background
-    pygame.draw.rect(screen, (30, 30, 45), (x, y, bar_w, h))
-    # Fill (top grows upward)
-    fill_h = int(h * prog)
-    pygame.draw.rect(screen, (120, 200, 255), (x, y + (h - fill_h), bar_w, fill_h))
+    pygame.draw.rect(frame, (30, 30, 45), (x, y, BAR_W, BAR_H))
     # Ticks every 10%
     for i in range(1, 10):
-        ty = y + int(h * (1 - i / 10))
-        pygame.draw.line(screen, (90, 90, 110), (x - 6, ty), (x, ty), 1)
+        ty = y + int(BAR_H * (1 - i / 10))
+        pygame.draw.line(frame, (90, 90, 110), (x - 6, ty), (x, ty), 1)
+    return frame
+
+
+def _draw_progress_bar(screen, frame, py: float, base_y: float, top_y: float):
+    total = max(1.0, base_y - top_y)
+    climbed = max(0.0, base_y - py)
+    prog = max(0.0, min(1.0, climbed / total))
+
+    screen.blit(frame, (BAR_X - 6, BAR_Y - 2))
+    # Fill (top grows upward)
+    fill_h = int(BAR_H * prog)
+    pygame.draw.rect(screen, (120, 200, 255), (BAR_X, BAR_Y + (BAR_H - fill_h), BAR_W, fill_h))
 
 
 if __name__ == "__main__":
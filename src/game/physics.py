@@ -1,87 +1,215 @@
-from dataclasses import dataclass
-from typing import Iterable, Tuple
+import math
+from typing import Dict, Iterable, List, Tuple, Union
 
 
-@dataclass
 class Rect:
-    x: float
-    y: float
-    w: float
-    h: float
+    """
+    Axis-aligned rectangle.
+
+    right and bottom are computed once at construction, so treat a Rect as
+    immutable and use move() to get a displaced copy.
+    """
+
+    __slots__ = ("x", "y", "w", "h", "right", "bottom")
+
+    def __init__(self, x: float, y: float, w: float, h: float):
+        self.x = x
+        self.y = y
+        self.w = w
+        self.h = h
+        self.right = x + w
+        self.bottom = y + h
+
+    def __repr__(self) -> str:
+        return f"Rect(x={self.x!r}, y={self.y!r}, w={self.w!r}, h={self.h!r})"
+
+    def __eq__(self, other: object) -> bool:
+        if other.__class__ is not Rect:
+            return NotImplemented
+        return (self.x, self.y, self.w, self.h) == (other.x, other.y, other.w, other.h)
+
+    __hash__ = None
 
     @property
     def left(self) -> float:
         return self.x
 
-    @property
-    def right(self) -> float:
-        return self.x + self.w
-
     @property
     def top(self) -> float:
         return self.y
 
-    @property
-    def bottom(self) -> float:
-        return self.y + self.h
-
     def move(self, dx: float, dy: float) -> "Rect":
         return Rect(self.x + dx, self.y + dy, self.w, self.h)
 
     def intersects(self, other: "Rect") -> bool:
-        return not (
-            self.right <= other.left
-            or self.left >= other.right
-            or self.bottom <= other.top
-            or self.top >= other.bottom
+        return (
+            self.x < other.right
+            and other.x < self.right
+            and self.y < other.bottom
+            and other.y < self.bottom
         )
 
 
+class SpatialHashGrid:
+    """
+    Static solids bucketed into fixed-size cells for broad-phase queries.
+
+    Levels with fewer than LINEAR_SCAN_MAX solids skip the grid entirely;
+    a plain scan is cheaper than hashing at that size.
+    """
+
+    CELL = 128  # roughly twice the player size
+    LINEAR_SCAN_MAX = 32
+
+    def __init__(self, solids: Iterable[Rect], cell: int = CELL):
+        self.cell = cell
+        self.solids: List[Rect] = list(solids)
+        # Buckets hold indices into self.solids so queries keep level order
+        self.cells: Dict[int, List[int]] = {}
+        if len(self.solids) >= self.LINEAR_SCAN_MAX:
+            for i, s in enumerate(self.solids):
+                for key in self._keys(s.x, s.y, s.right, s.bottom):
+                    self.cells.setdefault(key, []).append(i)
+
+    def __len__(self) -> int:
+        return len(self.solids)
+
+    def _keys(self, left: float, top: float, right: float, bottom: float) -> Iterable[int]:
+        cell = self.cell
+        x0, x1 = int(left // cell), int(right // cell)
+        y0, y1 = int(top // cell), int(bottom // cell)
+        for ix in range(x0, x1 + 1):
+            for iy in range(y0, y1 + 1):
+                yield (ix * 73856093) ^ (iy * 19349663)
+
+    def query(self, rect: Rect) -> List[Rect]:
+        """Solids that may overlap rect, in the order they were added."""
+        return self.query_box(rect.x, rect.y, rect.right, rect.bottom)
+
+    def query_box(self, left: float, top: float, right: float, bottom: float) -> List[Rect]:
+        """Like query(), for a box given by its edges."""
+        if not self.cells:
+            return self.solids
+        found = set()
+        cells = self.cells
+        for key in self._keys(left, top, right, bottom):
+            bucket = cells.get(key)
+            if bucket:
+                found.update(bucket)
+        solids = self.solids
+        return [solids[i] for i in sorted(found)]
+
+
+def friction_decay(friction: float, dt: float) -> float:
+    """Factor that scales velocity under friction (per second) over dt seconds."""
+    return math.exp(-friction * dt)
+
+
+def integrate_velocity(
+    vx: float,
+    vy: float,
+    ax: float,
+    decay: float,
+    gravity: float,
+    dt: float,
+    max_speed: float,
+    max_fall: float,
+) -> Tuple[float, float]:
+    """
+    Advance an actor's velocity by one step of dt seconds.
+
+    With no horizontal input (ax == 0) vx is scaled by decay (see
+    friction_decay); otherwise it accelerates and is clamped to
+    +/-max_speed. Gravity pulls vy down to at most max_fall.
+
+    Returns (vx, vy)
+    """
+    if not ax:
+        vx *= decay
+    else:
+        vx += ax * dt
+        vx = max(-max_speed, min(max_speed, vx))
+    vy += gravity * dt
+    return vx, min(vy, max_fall)
+
+
 def resolve_collisions(
-    rect: Rect, vx: float, vy: float, solids: Iterable[Rect]
+    rect: Rect, vx: float, vy: float, solids: Union[Iterable[Rect], SpatialHashGrid]
 ) -> Tuple[Rect, float, float, bool, bool]:
     """
     Move rect by (vx, vy) resolving collisions against solids.
 
+    solids may be a plain iterable or a SpatialHashGrid. Both axis passes
+    only test the solids that overlap the swept box covering the whole move.
+
     Returns (new_rect, resolved_vx, resolved_vy, on_ground, on_ceiling)
     """
+    if vx == 0 and vy == 0:
+        # Nothing moves, so nothing new can be hit
+        return rect, 0.0, 0.0, False, False
+
     on_ground = False
     on_ceiling = False
-
-    # Horizontal move first
-    new_rect = rect.move(vx, 0)
+    # Work on plain floats; the only Rect built is the one returned
+    x, y, w, h = rect.x, rect.y, rect.w, rect.h
+
+    # Every position either axis pass can test lies inside the swept box
+    left = x + vx if vx < 0 else x
+    right = (x + vx if vx > 0 else x) + w
+    top = y + vy if vy < 0 else y
+    bottom = (y + vy if vy > 0 else y) + h
+    if isinstance(solids, SpatialHashGrid):
+        pool = solids.query_box(left, top, right, bottom)
+    else:
+        if not isinstance(solids, (list, tuple)):
+            # May need a second pass below, so don't consume an iterator here
+            solids = list(solids)
+        pool = solids
+    candidates = [
+        s for s in pool if left < s.right and s.x < right and top < s.bottom and s.y < bottom
+    ]
+
+    # Horizontal move first (skipped entirely when there is no x motion)
     if vx != 0:
-        collided = _first_collision(new_rect, solids)
+        nx = x + vx
+        collided = _first_collision(nx, y, nx + w, y + h, candidates)
         if collided is not None:
             if vx > 0:
                 # place right next to the left side of solid
-                new_rect = Rect(collided.left - rect.w, rect.y, rect.w, rect.h)
+                nx = collided.x - w
             else:
                 # place left next to the right side of solid
-                new_rect = Rect(collided.right, rect.y, rect.w, rect.h)
+                nx = collided.right
             vx = 0.0
+        x = nx
 
     # Vertical move
-    new_rect = new_rect.move(0, vy)
     if vy != 0:
-        collided = _first_collision(new_rect, solids)
+        if x < left or x + w > right:
+            # Started inside a solid and got pushed out of the swept box
+            candidates = solids.solids if isinstance(solids, SpatialHashGrid) else solids
+        ny = y + vy
+        collided = _first_collision(x, ny, x + w, ny + h, candidates)
         if collided is not None:
             if vy > 0:
                 # landed on top
-                new_rect = Rect(new_rect.x, collided.top - rect.h, rect.w, rect.h)
+                ny = collided.y - h
                 on_ground = True
             else:
                 # hit ceiling
-                new_rect = Rect(new_rect.x, collided.bottom, rect.w, rect.h)
+                ny = collided.bottom
                 on_ceiling = True
             vy = 0.0
+        y = ny
 
-    return new_rect, vx, vy, on_ground, on_ceiling
+    return Rect(x, y, w, h), vx, vy, on_ground, on_ceiling
 
 
-def _first_collision(rect: Rect, solids: Iterable[Rect]):
+def _first_collision(
+    left: float, top: float, right: float, bottom: float, solids: Iterable[Rect]
+):
+    # Same test as Rect.intersects, against a box given by its edges
     for s in solids:
-        if rect.intersects(s):
+        if left < s.right and s.x < right and top < s.bottom and s.y < bottom:
             return s
     return None
-
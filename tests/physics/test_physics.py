@@ -1,6 +1,13 @@
 import math
+import random
 
-from game.physics import Rect, resolve_collisions
+from game.physics import (
+    Rect,
+    SpatialHashGrid,
+    friction_decay,
+    integrate_velocity,
+    resolve_collisions,
+)
 
 
 def test_horizontal_collision_stops_at_wall():
@@ -32,3 +39,106 @@ def test_no_collision_moves_freely():
     assert pr.x == 5 and pr.y == 7
     assert vx == 5 and vy == 7
     assert not on_ground and not on_ceiling
+
+
+def test_spatial_grid_matches_linear_scan():
+    # Enough solids to make the grid bucket them rather than scan linearly
+    solids = [Rect(-40, -5000, 40, 10000)]
+    solids += [Rect(60 + (i % 3) * 250, 500 - i * 90, 200, 20) for i in range(40)]
+    grid = SpatialHashGrid(solids)
+    assert grid.cells
+    player = Rect(300, 300, 40, 50)
+    assert len(grid.query(player)) < len(solids)
+    for vx, vy in [(0, 120), (0, -120), (-400, 0), (25, 60)]:
+        assert resolve_collisions(player, vx, vy, grid) == resolve_collisions(
+            player, vx, vy, solids
+        )
+
+
+def _reference_resolve(rect, vx, vy, solids):
+    # Straightforward two-pass sweep over every solid, as originally written
+    def first_hit(r):
+        return next((s for s in solids if r.intersects(s)), None)
+
+    on_ground = on_ceiling = False
+    x, y = rect.x + vx, rect.y
+    hit = first_hit(Rect(x, y, rect.w, rect.h)) if vx != 0 else None
+    if hit is not None:
+        x = hit.x - rect.w if vx > 0 else hit.right
+        vx = 0.0
+    y += vy
+    hit = first_hit(Rect(x, y, rect.w, rect.h)) if vy != 0 else None
+    if hit is not None:
+        if vy > 0:
+            y, on_ground = hit.y - rect.h, True
+        else:
+            y, on_ceiling = hit.bottom, True
+        vy = 0.0
+    return Rect(x, y, rect.w, rect.h), vx, vy, on_ground, on_ceiling
+
+
+def test_randomized_moves_match_reference():
+    # A tall board like the top one: floor, side walls, staggered platforms
+    width, height = 800, 600
+    solids = [
+        Rect(0, height - 40, width, 40),
+        Rect(-40, -5000, 40, 10000),
+        Rect(width, -5000, 40, 10000),
+    ]
+    solids += [Rect((60, 300, 540)[i % 3], 500 - i * 90, 200, 20) for i in range(1, 60)]
+    grid = SpatialHashGrid(solids)
+    rng = random.Random(1)
+    for _ in range(3000):
+        # Positions may start overlapping a solid, which is the tricky case
+        player = Rect(rng.uniform(-20, width), rng.uniform(-5000, height), 40, 50)
+        vx = rng.choice([0, rng.uniform(-30, 30)])
+        vy = rng.choice([0, rng.uniform(-30, 30)])
+        want = _reference_resolve(player, vx, vy, solids)
+        for source in (solids, grid, iter(solids)):
+            assert resolve_collisions(player, vx, vy, source) == want
+
+
+def test_integrate_velocity_accelerates_and_clamps():
+    vx, vy = integrate_velocity(290, 0, 8000, 1.0, 1700, 1 / 60, 300, 1000)
+    assert vx == 300
+    assert math.isclose(vy, 1700 / 60)
+    vx, vy = integrate_velocity(-290, 990, -8000, 1.0, 1700, 1 / 60, 300, 1000)
+    assert vx == -300
+    assert vy == 1000
+
+
+def test_integrate_velocity_friction_without_input():
+    vx, _ = integrate_velocity(300, 0, 0, friction_decay(8.0, 1 / 60), 0, 1 / 60, 300, 1000)
+    assert math.isclose(vx, 300 * math.exp(-8.0 / 60))
+    # Exact decay never overshoots past zero, even for a long frame
+    vx, _ = integrate_velocity(300, 0, 0, friction_decay(8.0, 0.5), 0, 0.5, 300, 1000)
+    assert 0 < vx < 300
+
+
+def test_zero_velocity_is_a_no_op():
+    platform = Rect(0, 100, 200, 20)
+    player = Rect(60, 50, 40, 50)  # resting exactly on the platform
+    pr, vx, vy, on_ground, on_ceiling = resolve_collisions(player, 0, 0, [platform])
+    assert pr == player
+    assert vx == 0 and vy == 0
+    assert not on_ground and not on_ceiling
+
+
+def test_pushed_out_of_floor_then_falls_onto_wall():
+    # Starting inside the floor, the x pass ejects the rect past the floor's
+    # right edge, outside the swept box; the y pass must still see the wall.
+    walls_and_floor = [
+        Rect(-40, -5000, 40, 10000),
+        Rect(800, -5000, 40, 10000),
+        Rect(0, 560, 800, 40),
+    ]
+    # Far-away platforms so the grid buckets instead of scanning linearly
+    padding = [Rect(60, -1000 - i * 90, 200, 20) for i in range(30)]
+    grid = SpatialHashGrid(walls_and_floor + padding)
+    assert grid.cells
+    player = Rect(390.99, 585.29, 40, 50)
+    for source in (walls_and_floor, grid):
+        pr, vx, vy, on_ground, on_ceiling = resolve_collisions(player, -11.07, 1.54, source)
+        assert (pr.x, pr.y) == (800, -5050)
+        assert vx == 0 and vy == 0
+        assert on_ground and not on_ceiling